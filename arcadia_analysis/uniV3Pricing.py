@@ -1,37 +1,66 @@
+import asyncio
 import math
 from web3 import Web3
 import web3
 from collections import defaultdict
+from functools import lru_cache
 
-# Function to add or update the dictionary
-def add_or_update_dict(dictionary, key, value):
-    dictionary[key] += value
-
-def mul_div(a, b, denominator):
-    """Replicate Solidity's mulDiv for full precision multiplication and division."""
-    return (a * b) // denominator
+def sqrt_price_from_price(price_num, price_den=1):
+    """
+    Exact Q96 square root of a price given as a numerator/denominator pair.
+    A float price also works (converted to an exact fraction), avoiding the
+    53-bit precision loss of computing price**0.5 in floating point.
+    """
+    if isinstance(price_num, float):
+        num, den = price_num.as_integer_ratio()
+        price_num, price_den = num, price_den * den
+    return math.isqrt((price_num << 192) // price_den)
 
 
-def sqrt_price_from_price(price):
-    return int((price**0.5) * 2**96)
+# log2 of the Uniswap tick base, computed once
+_LOG2_TICK_BASE = math.log2(1.0001)
 
 
 def sqrt_price_x96_to_tick(sqrtPriceX96):
-    # Base of the Uniswap tick system
-    tick_base = 1.0001
+    # The tick is log_{1.0001}(sqrtPrice^2) = 2 * log2(sqrtPrice) / log2(1.0001)
 
-    # Convert sqrtPriceX96 to the actual square root price by dividing by 2^96
-    # Note: This step might need adjustment based on how sqrtPriceX96 is represented in your context
-    sqrtPrice = sqrtPriceX96 / (2**96)
-
-    # Calculate the tick from the square root price
-    # The formula for tick calculation is log(sqrtPrice^2) / log(base), simplified to 2 * log(sqrtPrice) / log(base)
-    tick = math.log(sqrtPrice**2) / math.log(tick_base)
+    # Split off the magnitude with bit_length so only a [1, 2) mantissa goes
+    # through the float log; this keeps full precision even when sqrtPriceX96
+    # exceeds the 53-bit float range
+    msb = sqrtPriceX96.bit_length() - 1
+    mantissa = sqrtPriceX96 / (1 << msb)
+    log2_sqrt_price = (msb - 96) + math.log2(mantissa)
 
     # Return the tick rounded to the nearest integer, as ticks are integer values in Uniswap
-    return round(tick)
-
-
+    return round(2.0 * log2_sqrt_price / _LOG2_TICK_BASE)
+
+
+# Q128 multiplicand for bit i of abs(tick), i.e. sqrt(1.0001)^-(2^i) << 128
+_TICK_MULS = (
+    0xFFFCB933BD6FAD37AA2D162D1A594001,
+    0xFFF97272373D413259A46990580E213A,
+    0xFFF2E50F5F656932EF12357CF3C7FDCC,
+    0xFFE5CACA7E10E4E61C3624EAA0941CD0,
+    0xFFCB9843D60F6159C9DB58835C926644,
+    0xFF973B41FA98C081472E6896DFB254C0,
+    0xFF2EA16466C96A3843EC78B326B52861,
+    0xFE5DEE046A99A2A811C461F1969C3053,
+    0xFCBE86C7900A88AEDCFFC83B479AA3A4,
+    0xF987A7253AC413176F2B074CF7815E54,
+    0xF3392B0822B70005940C7A398E4B70F3,
+    0xE7159475A2C29B7443B29C7FA6E889D9,
+    0xD097F3BDFD2022B8845AD8F792AA5825,
+    0xA9F746462D870FDF8A65DC1F90E061E5,
+    0x70D869A156D2A1B890BB3DF62BAF32F7,
+    0x31BE135F97D08FD981231505542FCFA6,
+    0x9AA508B5B7A84E1C677DE54F3E99BC9,
+    0x5D6AF8DEDB81196699C329225EE604,
+    0x2216E584F5FA1EA926041BEDFE98,
+    0x48A170391F7DC42444E8FA2,
+)
+
+
+@lru_cache(maxsize=4096)
 def get_sqrt_ratio_at_tick(tick):
     MAX_TICK = 887272
 
@@ -39,49 +68,15 @@ def get_sqrt_ratio_at_tick(tick):
     if abs_tick > MAX_TICK:
         raise ValueError("Tick value out of bounds")
 
-    ratio = (
-        0xFFFCB933BD6FAD37AA2D162D1A594001
-        if abs_tick & 0x1
-        else 0x100000000000000000000000000000000
-    )
-    if abs_tick & 0x2:
-        ratio = (ratio * 0xFFF97272373D413259A46990580E213A) >> 128
-    if abs_tick & 0x4:
-        ratio = (ratio * 0xFFF2E50F5F656932EF12357CF3C7FDCC) >> 128
-    if abs_tick & 0x8:
-        ratio = (ratio * 0xFFE5CACA7E10E4E61C3624EAA0941CD0) >> 128
-    if abs_tick & 0x10:
-        ratio = (ratio * 0xFFCB9843D60F6159C9DB58835C926644) >> 128
-    if abs_tick & 0x20:
-        ratio = (ratio * 0xFF973B41FA98C081472E6896DFB254C0) >> 128
-    if abs_tick & 0x40:
-        ratio = (ratio * 0xFF2EA16466C96A3843EC78B326B52861) >> 128
-    if abs_tick & 0x80:
-        ratio = (ratio * 0xFE5DEE046A99A2A811C461F1969C3053) >> 128
-    if abs_tick & 0x100:
-        ratio = (ratio * 0xFCBE86C7900A88AEDCFFC83B479AA3A4) >> 128
-    if abs_tick & 0x200:
-        ratio = (ratio * 0xF987A7253AC413176F2B074CF7815E54) >> 128
-    if abs_tick & 0x400:
-        ratio = (ratio * 0xF3392B0822B70005940C7A398E4B70F3) >> 128
-    if abs_tick & 0x800:
-        ratio = (ratio * 0xE7159475A2C29B7443B29C7FA6E889D9) >> 128
-    if abs_tick & 0x1000:
-        ratio = (ratio * 0xD097F3BDFD2022B8845AD8F792AA5825) >> 128
-    if abs_tick & 0x2000:
-        ratio = (ratio * 0xA9F746462D870FDF8A65DC1F90E061E5) >> 128
-    if abs_tick & 0x4000:
-        ratio = (ratio * 0x70D869A156D2A1B890BB3DF62BAF32F7) >> 128
-    if abs_tick & 0x8000:
-        ratio = (ratio * 0x31BE135F97D08FD981231505542FCFA6) >> 128
-    if abs_tick & 0x10000:
-        ratio = (ratio * 0x9AA508B5B7A84E1C677DE54F3E99BC9) >> 128
-    if abs_tick & 0x20000:
-        ratio = (ratio * 0x5D6AF8DEDB81196699C329225EE604) >> 128
-    if abs_tick & 0x40000:
-        ratio = (ratio * 0x2216E584F5FA1EA926041BEDFE98) >> 128
-    if abs_tick & 0x80000:
-        ratio = (ratio * 0x48A170391F7DC42444E8FA2) >> 128
+    # Fold in the multiplicand for each set bit instead of 20 unrolled branches
+    ratio = 1 << 128
+    bits = abs_tick
+    i = 0
+    while bits:
+        if bits & 1:
+            ratio = (ratio * _TICK_MULS[i]) >> 128
+        bits >>= 1
+        i += 1
 
     if tick > 0:
         ratio = (1 << 256) // ratio
@@ -96,7 +91,7 @@ def get_amount0_for_liquidity(sqrtRatioAX96, sqrtRatioBX96, liquidity):
         sqrtRatioAX96, sqrtRatioBX96 = sqrtRatioBX96, sqrtRatioAX96
 
     return (
-        mul_div(liquidity << 96, sqrtRatioBX96 - sqrtRatioAX96, sqrtRatioBX96)
+        ((liquidity << 96) * (sqrtRatioBX96 - sqrtRatioAX96)) // sqrtRatioBX96
         // sqrtRatioAX96
     )
 
@@ -106,7 +101,7 @@ def get_amount1_for_liquidity(sqrtRatioAX96, sqrtRatioBX96, liquidity):
     if sqrtRatioAX96 > sqrtRatioBX96:
         sqrtRatioAX96, sqrtRatioBX96 = sqrtRatioBX96, sqrtRatioAX96
 
-    return mul_div(liquidity, sqrtRatioBX96 - sqrtRatioAX96, 2**96)
+    return (liquidity * (sqrtRatioBX96 - sqrtRatioAX96)) >> 96
 
 
 def get_amounts_from_ticks(tickCurrent, tickLower, tickUpper, liquidity):
@@ -129,10 +124,130 @@ def get_amounts_from_ticks(tickCurrent, tickLower, tickUpper, liquidity):
     return amount0, amount1
 
 
+def get_amounts_from_ticks_batch(ticks_current, ticks_lower, ticks_upper, liquidities):
+    """
+    Price a batch of positions in one pass. Takes equal-length sequences of
+    current/lower/upper ticks and liquidity and returns two lists with the
+    token0/token1 amounts per position. Repeated ticks hit the memoized
+    get_sqrt_ratio_at_tick, so a batch sharing pools only pays the big-int
+    ladder for its distinct ticks.
+    """
+    amounts0, amounts1 = [], []
+    for tick_current, tick_lower, tick_upper, liquidity in zip(
+        ticks_current, ticks_lower, ticks_upper, liquidities
+    ):
+        amount0, amount1 = get_amounts_from_ticks(tick_current, tick_lower, tick_upper, liquidity)
+        amounts0.append(amount0)
+        amounts1.append(amount1)
+    return amounts0, amounts1
 
-def get_nft_positions_details(nft_contract_address, w3, token_id):
-    
-    abi = [
+
+
+# Multicall3 is deployed at the same address on every major chain
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    }
+]
+
+POSITIONS_SELECTOR = Web3.keccak(text="positions(uint256)")[:4]
+SLOT0_SELECTOR = Web3.keccak(text="slot0()")[:4]
+
+POSITIONS_OUTPUT_TYPES = [
+    "uint96", "address", "address", "address", "uint24", "int24", "int24",
+    "uint128", "uint256", "uint256", "uint128", "uint128",
+]
+SLOT0_OUTPUT_TYPES = ["uint160", "int24", "uint16", "uint16", "uint16", "uint8", "bool"]
+
+
+# Contract instances cached by (address, abi) so ABI parsing and function
+# binding only happen once per contract instead of on every call
+_CONTRACT_CACHE = {}
+
+def _get_contract(w3, address, abi):
+    key = (address, id(abi))
+    cached = _CONTRACT_CACHE.get(key)
+    if cached is None or cached[0] is not abi:
+        cached = (abi, w3.eth.contract(address=address, abi=abi))
+        _CONTRACT_CACHE[key] = cached
+    return cached[1]
+
+
+def multicall(calls, w3):
+    """
+    Execute a batch of read-only calls through Multicall3 in a single eth_call.
+
+    calls: list of (target_address, calldata) tuples.
+    Returns a list of (success, return_data) tuples in the same order.
+    """
+    contract = _get_contract(
+        w3, Web3.to_checksum_address(MULTICALL3_ADDRESS), MULTICALL3_ABI
+    )
+    aggregated = [
+        (Web3.to_checksum_address(target), True, calldata) for target, calldata in calls
+    ]
+    return contract.functions.aggregate3(aggregated).call()
+
+
+def _decode_positions_result(return_data, w3):
+    result = w3.codec.decode(POSITIONS_OUTPUT_TYPES, return_data)
+    return {
+        "nonce": result[0],
+        "operator": Web3.to_checksum_address(result[1]),
+        "token0": Web3.to_checksum_address(result[2]),
+        "token1": Web3.to_checksum_address(result[3]),
+        "fee": result[4],
+        "tickLower": result[5],
+        "tickUpper": result[6],
+        "liquidity": result[7],
+        "feeGrowthInside0LastX128": result[8],
+        "feeGrowthInside1LastX128": result[9],
+        "tokensOwed0": result[10],
+        "tokensOwed1": result[11],
+    }
+
+
+def _decode_slot0_result(return_data, w3):
+    result = w3.codec.decode(SLOT0_OUTPUT_TYPES, return_data)
+    return {
+        "sqrtPriceX96": result[0],
+        "tick": result[1],
+        "observationIndex": result[2],
+        "observationCardinality": result[3],
+        "observationCardinalityNext": result[4],
+        "feeProtocol": result[5],
+        "unlocked": result[6],
+    }
+
+
+POSITIONS_ABI = [
         {
         "inputs": [{"internalType": "uint256", "name": "tokenId", "type": "uint256"}],
         "name": "positions",
@@ -162,9 +277,11 @@ def get_nft_positions_details(nft_contract_address, w3, token_id):
         "type": "function",
         }
     ]
-    
+
+def get_nft_positions_details(nft_contract_address, w3, token_id):
+
     contract_address = Web3.to_checksum_address(nft_contract_address)
-    contract = w3.eth.contract(address=contract_address, abi=abi)
+    contract = _get_contract(w3, contract_address, POSITIONS_ABI)
     try:
         result = contract.functions.positions(token_id).call()
     except web3.exceptions.ContractLogicError:
@@ -187,9 +304,7 @@ def get_nft_positions_details(nft_contract_address, w3, token_id):
     
     return details
 
-def get_uniswap_slot0(pool_address, w3):
-    
-    abi = [
+SLOT0_ABI = [
         {
         "inputs": [],
         "name": "slot0",
@@ -214,9 +329,11 @@ def get_uniswap_slot0(pool_address, w3):
         "type": "function",
     }
     ]
-    
+
+def get_uniswap_slot0(pool_address, w3):
+
     contract_address = Web3.to_checksum_address(pool_address)
-    contract = w3.eth.contract(address=contract_address, abi=abi)
+    contract = _get_contract(w3, contract_address, SLOT0_ABI)
     try:
         result = contract.functions.slot0().call()
     except web3.exceptions.ContractLogicError:
@@ -234,9 +351,7 @@ def get_uniswap_slot0(pool_address, w3):
     
     return details
 
-def get_account_data(account_address, w3):
-    
-    account_abi = [{
+ACCOUNT_ABI = [{
         "inputs": [],
         "name": "generateAssetData",
         "outputs": [
@@ -251,12 +366,15 @@ def get_account_data(account_address, w3):
         "stateMutability": "view",
         "type": "function",
     }]
-    
+
+def get_account_data(account_address, w3):
+
     try:
         # Pool contract
-        contract = w3.eth.contract(
-            address=Web3.to_checksum_address(account_address), #0xb2DF87b16682435bdf29494fEA44dF5374F22f3E
-            abi=account_abi
+        contract = _get_contract(
+            w3,
+            Web3.to_checksum_address(account_address), #0xb2DF87b16682435bdf29494fEA44dF5374F22f3E
+            ACCOUNT_ABI
         )
         data = contract.functions.generateAssetData().call()
         return data
@@ -264,81 +382,236 @@ def get_account_data(account_address, w3):
         return f'Error fetching pool_oracle: {e}'
     
 
+POOL_NFT_MAPPINGS = [
+    {
+        "name": "wETH-USDC",
+        "pool": "0xd0b53D9277642d899DF5C87A3966A349A798F224",
+        "token0": "0x4200000000000000000000000000000000000006",
+        "token1": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
+        "decimal0": 18,
+        "decimal1": 6
+    },
+    {
+        "name": "wETH-USDbC",
+        "pool": "0x4C36388bE6F416A29C8d8Eee81C771cE6bE14B18",
+        "token0": "0x4200000000000000000000000000000000000006",
+        "token1": "0xd9aAEc86B65D86f6A7B5B1b0c42FFA531710b6CA",
+        "decimal0": 18,
+        "decimal1": 6
+    }
+]
+
+# Built once at import; a frozenset key matches either token ordering without
+# storing both permutations
+_POOL_LOOKUP = {
+    frozenset((pool["token0"].lower(), pool["token1"].lower())): pool
+    for pool in POOL_NFT_MAPPINGS
+}
+
+
 def get_arcadia_account_nft_position(asset_data, w3):
     """
     Sample asset_data:
     [
-        ["0x2Ae3F1Ec7F1F5012CFEab0185bfc7aa3cf0DEc22", 
-        "0x4200000000000000000000000000000000000006", 
-        "0x03a520b32C04BF3bEEf7BEb72E919cf822Ed34f1"], 
-        [0, 0, 105363], 
+        ["0x2Ae3F1Ec7F1F5012CFEab0185bfc7aa3cf0DEc22",
+        "0x4200000000000000000000000000000000000006",
+        "0x03a520b32C04BF3bEEf7BEb72E919cf822Ed34f1"],
+        [0, 0, 105363],
         [12289573077240346, 13102161708949451, 1]
     ]
     """
-    POOL_NFT_MAPPINGS = [
-        {
-            "name": "wETH-USDC",
-            "pool": "0xd0b53D9277642d899DF5C87A3966A349A798F224",
-            "token0": "0x4200000000000000000000000000000000000006",
-            "token1": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
-            "decimal0": 18,
-            "decimal1": 6
-        },
-        {
-            "name": "wETH-USDbC",
-            "pool": "0x4C36388bE6F416A29C8d8Eee81C771cE6bE14B18",
-            "token0": "0x4200000000000000000000000000000000000006",
-            "token1": "0xd9aAEc86B65D86f6A7B5B1b0c42FFA531710b6CA",
-            "decimal0": 18,
-            "decimal1": 6
-        }
-    ]
-    
-    zero_indices = [index for index, value in enumerate(asset_data[1]) if value == 0]
-    non_zero_indices = [index for index, value in enumerate(asset_data[1]) if value != 0]
+    # Split plain-balance assets from NFT positions in a single pass
+    zero_indices, non_zero_indices = [], []
+    for index, value in enumerate(asset_data[1]):
+        (zero_indices if value == 0 else non_zero_indices).append(index)
 
     result = defaultdict(int)
 
-    # Creating a lookup dictionary for quick access with normalized tokens
-    pool_lookup = {}
-    for pool in POOL_NFT_MAPPINGS:
-        token0 = pool["token0"].lower()
-        token1 = pool["token1"].lower()
-        pool_lookup[(token0, token1)] = pool
-        pool_lookup[(token1, token0)] = pool  # To handle reversed token order
+    for i in zero_indices:
+        result[asset_data[0][i]] += asset_data[2][i]
+
+    # Batch every positions() lookup into a single Multicall3 eth_call
+    position_calls = [
+        (asset_data[0][i], POSITIONS_SELECTOR + w3.codec.encode(["uint256"], [asset_data[1][i]]))
+        for i in non_zero_indices
+    ]
+    position_results = multicall(position_calls, w3) if position_calls else []
+
+    pending = []  # (nft_positions_details, matching_pool) pairs awaiting slot0 data
+    pool_addresses = []
+    for i, (success, return_data) in zip(non_zero_indices, position_results):
+        nft_contract = asset_data[0][i]
+
+        if not success or not return_data:
+            result[nft_contract] += 0 # Records the NFT if it doesnot belong to Uniswap
+            continue  # Skip if nft_positions_details could not be fetched
+
+        nft_positions_details = _decode_positions_result(return_data, w3)
+
+        # Extracting and normalizing token0 and token1 from nft_positions_details
+        token0 = nft_positions_details["token0"].lower()
+        token1 = nft_positions_details["token1"].lower()
+
+        # Finding the matching pool using the module-level lookup dictionary
+        matching_pool = _POOL_LOOKUP.get(frozenset((token0, token1)))
+        if not matching_pool:
+            result[nft_contract] += 0 # Records the NFT if it doesnot belong to the Mapping
+            continue  # Skip if no matching pool is found
+
+        pending.append((nft_positions_details, matching_pool))
+        if matching_pool["pool"] not in pool_addresses:
+            pool_addresses.append(matching_pool["pool"])
+
+    # One more multicall covers slot0 for every distinct pool touched above
+    slot0_calls = [(pool, SLOT0_SELECTOR) for pool in pool_addresses]
+    slot0_results = multicall(slot0_calls, w3) if slot0_calls else []
+
+    slot0_by_pool = {}
+    for pool, (success, return_data) in zip(pool_addresses, slot0_results):
+        if success and return_data:
+            slot0_by_pool[pool] = _decode_slot0_result(return_data, w3)
+
+    # Skip positions whose slot0 details could not be fetched, then price the
+    # remainder as one batch
+    priced = [
+        (details, pool) for details, pool in pending if pool["pool"] in slot0_by_pool
+    ]
+    amounts0, amounts1 = get_amounts_from_ticks_batch(
+        [slot0_by_pool[pool["pool"]]["tick"] for _, pool in priced],
+        [details["tickLower"] for details, _ in priced],
+        [details["tickUpper"] for details, _ in priced],
+        [details["liquidity"] for details, _ in priced],
+    )
+
+    for (nft_positions_details, _), amount0, amount1 in zip(priced, amounts0, amounts1):
+        result[nft_positions_details["token0"]] += amount0
+        result[nft_positions_details["token1"]] += amount1
+
+    return result
+
+async def async_get_nft_positions_details(nft_contract_address, async_w3, token_id):
+
+    contract_address = Web3.to_checksum_address(nft_contract_address)
+    contract = async_w3.eth.contract(address=contract_address, abi=POSITIONS_ABI)
+    try:
+        result = await contract.functions.positions(token_id).call()
+    except web3.exceptions.ContractLogicError:
+        return None
+
+    details = {
+        "nonce": result[0],
+        "operator": result[1],
+        "token0": result[2],
+        "token1": result[3],
+        "fee": result[4],
+        "tickLower": result[5],
+        "tickUpper": result[6],
+        "liquidity": result[7],
+        "feeGrowthInside0LastX128": result[8],
+        "feeGrowthInside1LastX128": result[9],
+        "tokensOwed0": result[10],
+        "tokensOwed1": result[11],
+    }
+
+    return details
+
+
+async def async_get_uniswap_slot0(pool_address, async_w3):
+
+    contract_address = Web3.to_checksum_address(pool_address)
+    contract = async_w3.eth.contract(address=contract_address, abi=SLOT0_ABI)
+    try:
+        result = await contract.functions.slot0().call()
+    except web3.exceptions.ContractLogicError:
+        return None
+
+    details = {
+        "sqrtPriceX96": result[0],
+        "tick": result[1],
+        "observationIndex": result[2],
+        "observationCardinality": result[3],
+        "observationCardinalityNext": result[4],
+        "feeProtocol": result[5],
+        "unlocked": result[6]
+    }
+
+    return details
+
+
+async def async_get_arcadia_account_nft_position(asset_data, async_w3, max_concurrency=20):
+    """
+    Async variant of get_arcadia_account_nft_position for providers where
+    Multicall3 batching is not an option. The per-NFT positions() calls and
+    the per-pool slot0() calls run concurrently via asyncio.gather, capped
+    by max_concurrency so the provider's rate limits are respected. Pass an
+    AsyncWeb3(AsyncHTTPProvider(...)) instance as async_w3.
+    """
+    # Split plain-balance assets from NFT positions in a single pass
+    zero_indices, non_zero_indices = [], []
+    for index, value in enumerate(asset_data[1]):
+        (zero_indices if value == 0 else non_zero_indices).append(index)
+
+    result = defaultdict(int)
 
     for i in zero_indices:
-        add_or_update_dict(result, asset_data[0][i], asset_data[2][i])
-    
-    for i in non_zero_indices:
+        result[asset_data[0][i]] += asset_data[2][i]
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_positions(nft_contract, token_id):
+        async with semaphore:
+            return await async_get_nft_positions_details(nft_contract, async_w3, token_id)
+
+    details_list = await asyncio.gather(
+        *(fetch_positions(asset_data[0][i], asset_data[1][i]) for i in non_zero_indices)
+    )
+
+    pending = []  # (nft_positions_details, matching_pool) pairs awaiting slot0 data
+    pool_addresses = []
+    for i, nft_positions_details in zip(non_zero_indices, details_list):
         nft_contract = asset_data[0][i]
-        nft_positions_details = get_nft_positions_details(nft_contract_address=nft_contract, w3=w3, token_id=asset_data[1][i])
-        
+
         if not nft_positions_details:
-            add_or_update_dict(result, nft_contract, 0) # Records the NFT if it doesnot belong to Uniswap
+            result[nft_contract] += 0 # Records the NFT if it doesnot belong to Uniswap
             continue  # Skip if nft_positions_details could not be fetched
-        
+
         # Extracting and normalizing token0 and token1 from nft_positions_details
         token0 = nft_positions_details["token0"].lower()
         token1 = nft_positions_details["token1"].lower()
 
-        # Finding the matching pool using the lookup dictionary
-        matching_pool = pool_lookup.get((token0, token1))
+        # Finding the matching pool using the module-level lookup dictionary
+        matching_pool = _POOL_LOOKUP.get(frozenset((token0, token1)))
         if not matching_pool:
-            add_or_update_dict(result, nft_contract, 0) # Records the NFT if it doesnot belong to the Mapping
+            result[nft_contract] += 0 # Records the NFT if it doesnot belong to the Mapping
             continue  # Skip if no matching pool is found
-        
-        slot0 = get_uniswap_slot0(pool_address=matching_pool["pool"], w3=w3)
-        if not slot0:
-            continue  # Skip if slot0 details could not be fetched
-        
-        current_tick = slot0["tick"]
-        lower_tick = nft_positions_details["tickLower"]
-        upper_tick = nft_positions_details["tickUpper"]
-        
-        amount0, amount1 = get_amounts_from_ticks(current_tick, lower_tick, upper_tick, nft_positions_details["liquidity"])
-        
-        add_or_update_dict(result, nft_positions_details["token0"], amount0)
-        add_or_update_dict(result, nft_positions_details["token1"], amount1)
-    
-    return result
\ No newline at end of file
+
+        pending.append((nft_positions_details, matching_pool))
+        if matching_pool["pool"] not in pool_addresses:
+            pool_addresses.append(matching_pool["pool"])
+
+    async def fetch_slot0(pool_address):
+        async with semaphore:
+            return await async_get_uniswap_slot0(pool_address, async_w3)
+
+    slot0_list = await asyncio.gather(*(fetch_slot0(pool) for pool in pool_addresses))
+    slot0_by_pool = {
+        pool: slot0 for pool, slot0 in zip(pool_addresses, slot0_list) if slot0
+    }
+
+    # Skip positions whose slot0 details could not be fetched, then price the
+    # remainder as one batch
+    priced = [
+        (details, pool) for details, pool in pending if pool["pool"] in slot0_by_pool
+    ]
+    amounts0, amounts1 = get_amounts_from_ticks_batch(
+        [slot0_by_pool[pool["pool"]]["tick"] for _, pool in priced],
+        [details["tickLower"] for details, _ in priced],
+        [details["tickUpper"] for details, _ in priced],
+        [details["liquidity"] for details, _ in priced],
+    )
+
+    for (nft_positions_details, _), amount0, amount1 in zip(priced, amounts0, amounts1):
+        result[nft_positions_details["token0"]] += amount0
+        result[nft_positions_details["token1"]] += amount1
+
+    return result
@@ -7,23 +7,70 @@ import sys
 from dotenv import load_dotenv
 import os
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
 
 def process_funding_rates(df, column_name, position=1):
     """ Process funding rates and calculate interest and cumulative interest. """
-    # Extract and rename the column
-    new_df = df[[column_name]].rename(columns={column_name: 'funding_rate'})
-    new_df['neg_funding_rate'] = new_df['funding_rate'].apply(lambda x: x if x < 0 else 0)
+    # Work on the raw ndarray so every step below is a single vectorized pass
+    fr = df[column_name].to_numpy(dtype=np.float64, copy=False)
+    neg = np.minimum(fr, 0.0)
+
+    # Calculate interest and cumulative interest; the daily scale factor is
+    # loop-invariant so compute it once
+    scale = position / 365.0
+    interest = fr * scale
+    neg_interest = neg * scale
+
+    cum_interest = interest.cumsum()
+    neg_cum_interest = neg_interest.cumsum()
+
+    # Assemble the result in one shot instead of growing the frame column by column
+    new_df = pd.DataFrame({
+        'funding_rate': fr,
+        'neg_funding_rate': neg,
+        'interest': interest,
+        'neg_interest': neg_interest,
+        'cum_interest': cum_interest,
+        'neg_cum_interest': neg_cum_interest,
+    }, index=df.index, copy=False)
 
-    # Calculate interest and cumulative interest
-    new_df['interest'] = new_df['funding_rate'] * position / 365
-    new_df['neg_interest'] = new_df['neg_funding_rate'] * position / 365
-    
-    new_df['cum_interest'] = new_df['interest'].cumsum()
-    new_df['neg_cum_interest'] = new_df['neg_interest'].cumsum()
-    
     return new_df
 
 
+def process_all_funding_rates(df_all, position=1):
+    """
+    Process funding rates for several exchanges at once. Works like
+    process_funding_rates, but takes a (T, K) DataFrame with one funding-rate
+    column per CEX and computes each step on the full matrix, so the two
+    cumulative sums run as a single strided pass over all exchanges instead
+    of K independent ones.
+
+    Returns a DataFrame with MultiIndex columns (cex, metric), where the
+    metrics match the columns produced by process_funding_rates.
+    """
+    arr = df_all.to_numpy(dtype=np.float64)
+    neg = np.minimum(arr, 0.0)
+
+    scale = position / 365.0
+    interest = arr * scale
+    neg_interest = neg * scale
+
+    cum_interest = np.add.accumulate(interest, axis=0)
+    neg_cum_interest = np.add.accumulate(neg_interest, axis=0)
+
+    metrics = ['funding_rate', 'neg_funding_rate', 'interest', 'neg_interest',
+               'cum_interest', 'neg_cum_interest']
+    stacked = np.stack(
+        [arr, neg, interest, neg_interest, cum_interest, neg_cum_interest], axis=2)
+
+    return pd.DataFrame(
+        stacked.reshape(len(df_all), -1),
+        index=df_all.index,
+        columns=pd.MultiIndex.from_product([df_all.columns, metrics]),
+    )
+
+
 def plot_interest_with_highlights(df, title):
     """
     Plot cumulative interests with different highlighting methods for days with zero negative interest,
@@ -55,6 +102,64 @@ def plot_interest_with_highlights(df, title):
     plt.show()
     
 
+def _centered_rolling_mean(values, window):
+    """
+    Centered rolling mean computed with the cumsum trick in a single pass,
+    with edges padded by the first/last full-window mean (same result as
+    rolling(center=True).mean() followed by bfill/ffill).
+    """
+    n = len(values)
+    if window <= 1:
+        return values.astype(np.float64, copy=True)
+    if n < window:
+        # Not a single full window; rolling().mean() would be all-NaN
+        # even after the edge fills
+        return np.full(n, np.nan)
+
+    c = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    ma = (c[window:] - c[:-window]) / window
+
+    # rolling(center=True) labels the first full window at position window // 2
+    lead = window // 2
+    out = np.empty(n, dtype=np.float64)
+    out[:lead] = ma[0]
+    out[lead:lead + ma.size] = ma
+    out[lead + ma.size:] = ma[-1]
+    return out
+
+
+def _find_falls(is_fall, day_offsets, ignore_window):
+    """
+    Sequential state-machine scan that returns start/end positions of fall
+    periods, merging short interruptions: while a fall is open, a non-fall
+    day only closes it once more than ignore_window days have elapsed since
+    the fall started. Operates on plain ndarrays (bool flags and int64 day
+    offsets) so the scan never touches per-row pandas objects; the body is
+    also njit-compatible should numba ever be added as a dependency.
+    """
+    starts, ends = [], []
+    fall_start = -1
+    n = len(is_fall)
+
+    for i in range(n):
+        if is_fall[i]:
+            if fall_start < 0:
+                fall_start = i
+        elif fall_start >= 0:
+            if day_offsets[i] - day_offsets[fall_start] <= ignore_window:
+                continue
+            starts.append(fall_start)
+            ends.append(i - 1)
+            fall_start = -1
+
+    # Close any open fall period
+    if fall_start >= 0:
+        starts.append(fall_start)
+        ends.append(n - 1)
+
+    return np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64)
+
+
 def identify_and_merge_falls(df, window_size, ignore_window):
     """
     Identifies falls in the insurance fund and merges close falls into single events.
@@ -68,40 +173,31 @@ def identify_and_merge_falls(df, window_size, ignore_window):
     - DataFrame: Processed DataFrame with start and end dates and values of merged falls.
     """
     # Applying a simple smoothing technique using a rolling window
-    df['smoothed_fund'] = df['neg_cum_interest'].rolling(window=window_size, center=True).mean().fillna(method='bfill').fillna(method='ffill')
+    df['smoothed_fund'] = _centered_rolling_mean(df['neg_cum_interest'].to_numpy(dtype=np.float64), window_size)
 
     # Calculate the daily change in the smoothed insurance fund
-    df['change_in_smoothed_fund'] = df['smoothed_fund'].diff().fillna(0)
+    smoothed = df['smoothed_fund'].to_numpy(dtype=np.float64)
+    df['change_in_smoothed_fund'] = np.diff(smoothed, prepend=smoothed[:1])
 
     # Define a fall as a negative change
-    df['is_fall'] = df['change_in_smoothed_fund'] < 0
+    is_fall = df['change_in_smoothed_fund'].to_numpy() < 0
+    df['is_fall'] = is_fall
 
-    # Find the start and end of each significant fall period
-    falls = []
-    fall_start = None
+    # Scan for fall periods, merging interruptions shorter than ignore_window
+    day_offsets = (df.index - df.index[0]).days.to_numpy(dtype=np.int64)
+    starts, ends = _find_falls(is_fall, day_offsets, ignore_window)
 
-    for i, row in df.iterrows():
-        if row['is_fall']:
-            if fall_start is None:
-                fall_start = i
-        else:
-            if fall_start is not None:
-                # Calculate the number of days between fall_start and i
-                days_between = (i - fall_start).days
-                if days_between <= ignore_window:
-                    continue
-                falls.append((fall_start, i - pd.Timedelta(days=1),
-                              df.loc[fall_start, 'smoothed_fund'], df.loc[i - pd.Timedelta(days=1), 'smoothed_fund']))
-                fall_start = None
-
-    # Close any open fall period
-    if fall_start is not None:
-        falls.append((fall_start, df.index[-1],
-                      df.loc[fall_start, 'smoothed_fund'], df.iloc[-1]['smoothed_fund']))
-
-    # Create a DataFrame to summarize the falls
-    falls_df = pd.DataFrame(falls, columns=['Start_Date', 'End_Date', 'Start_Fund', 'End_Fund'])
-    falls_df['Difference'] = falls_df['Start_Fund'] - falls_df['End_Fund']
+    # Create a DataFrame to summarize the falls; start/end fund values come
+    # from one fancy-index gather on the smoothed ndarray
+    start_fund = smoothed[starts]
+    end_fund = smoothed[ends]
+    falls_df = pd.DataFrame({
+        'Start_Date': df.index[starts],
+        'End_Date': df.index[ends],
+        'Start_Fund': start_fund,
+        'End_Fund': end_fund,
+        'Difference': start_fund - end_fund,
+    })
 
     return falls_df
 
@@ -124,21 +220,35 @@ def plot_falls(df, falls_df, title):
     # Plot smoothed fund data
     plt.plot(df.index, df['smoothed_fund'], label='Smoothed Fund', color='skyblue', linewidth=3)
     
-    # Highlight fall periods
-    for i, row in falls_df.iterrows():
-        fall_period = df.loc[row['Start_Date']:row['End_Date']]
-        plt.plot(fall_period.index, fall_period['smoothed_fund'], color='red', linewidth=1, alpha=0.8)
-        
+    # Highlight fall periods with one LineCollection and one fill_between
+    # instead of a Line2D artist per fall
+    x = mdates.date2num(df.index)
+    smoothed = df['smoothed_fund'].to_numpy()
+    segments = []
+    fall_mask = np.zeros(len(df), dtype=bool)
+
+    for fall_number, (start_date, end_date) in enumerate(
+            zip(falls_df['Start_Date'], falls_df['End_Date']), start=1):
+        start_pos = df.index.searchsorted(start_date)
+        end_pos = df.index.searchsorted(end_date, side='right')
+        fall_mask[start_pos:end_pos] = True
+        segments.append(np.column_stack([x[start_pos:end_pos], smoothed[start_pos:end_pos]]))
+
         # Add text annotation for each fall
-        mid_point = fall_period.index[len(fall_period) // 2]
-        plt.annotate(f'Fall {i+1}', (mid_point, fall_period['smoothed_fund'].iloc[len(fall_period) // 2]),
+        mid_pos = start_pos + (end_pos - start_pos) // 2
+        plt.annotate(f'Fall {fall_number}', (df.index[mid_pos], smoothed[mid_pos]),
                      xytext=(0, 30), textcoords='offset points', ha='center', va='bottom',
                      bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.5),
                      arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
 
-    # Add a legend entry for falls
-    plt.plot([], [], color='red', linewidth=2, label='Fall Periods')
-    
+    plt.gca().add_collection(
+        LineCollection(segments, colors='red', linewidths=1, alpha=0.8, label='Fall Periods'))
+
+    # Shade all fall periods in a single pass
+    plt.fill_between(df.index, smoothed, smoothed.min(), where=fall_mask,
+                     color='red', alpha=0.1)
+
+
     plt.title(f'{title} - Insurance Fund Over Time with Smoothed Data and Highlighted Falls')
     plt.xlabel('Date')
     plt.ylabel('Insurance Fund (BTC)')
@@ -159,8 +269,10 @@ def extract_max_difference_row(df):
     Returns:
     - list: A list containing a dictionary where each key-value pair corresponds to column-name and cell-value of the row with the maximum 'Difference'.
     """
-    max_diff_row = df.loc[df['Difference'].idxmax()]
-    return [max_diff_row.to_dict()]
+    # argmax on the ndarray plus a positional row grab avoids idxmax's
+    # label round-trip
+    max_diff_pos = int(np.argmax(df['Difference'].to_numpy()))
+    return [dict(zip(df.columns, df.iloc[max_diff_pos]))]
 
 
 def extract_rate_from_endpoints(rate_df, endpoint_dict, cex=None):
@@ -178,29 +290,19 @@ def extract_rate_from_endpoints(rate_df, endpoint_dict, cex=None):
     # Extract date range from endpoint_dict
     start_date = endpoint_dict['Start_Date']
     end_date = endpoint_dict['End_Date']
-    
-    # Slice the DataFrame to get data within the specified date range
-    sliced_df = rate_df.loc[start_date:end_date]
-    
-    # Define column names based on whether a CEX name is provided
+
+    # Locate the slice positionally; the index is a monotonic DatetimeIndex,
+    # so searchsorted gives the same rows as .loc[start:end] without the
+    # label-lookup overhead
+    start_pos = rate_df.index.searchsorted(start_date, side='left')
+    end_pos = rate_df.index.searchsorted(end_date, side='right')
+
+    columns = ['funding_rate', 'neg_funding_rate', 'cum_interest', 'neg_cum_interest']
+    sliced_df = rate_df.iloc[start_pos:end_pos][columns]
+
+    # Prefix the column names when a CEX name is provided; rename with
+    # copy=False relabels the slice without copying the data
     if cex:
-        funding_rate_col = f"{cex}_funding_rate"
-        neg_funding_rate_col = f"{cex}_neg_funding_rate"
-        cum_interest_col = f"{cex}_cum_interest"
-        neg_cum_interest_col = f"{cex}_neg_cum_interest"
-        	
-    else:
-        funding_rate_col = "funding_rate"
-        neg_funding_rate_col = "neg_funding_rate"
-        cum_interest_col = "cum_interest"
-        neg_cum_interest_col = "neg_cum_interest"
-
-    # Create a new DataFrame with the specified column names
-    new_df = pd.DataFrame({
-        funding_rate_col: sliced_df['funding_rate'],
-        neg_funding_rate_col: sliced_df['neg_funding_rate'],
-        cum_interest_col: sliced_df['cum_interest'],
-        neg_cum_interest_col: sliced_df['neg_cum_interest'],
-    })
+        sliced_df = sliced_df.rename(columns={col: f"{cex}_{col}" for col in columns}, copy=False)
 
-    return new_df
\ No newline at end of file
+    return sliced_df
\ No newline at end of file
@@ -1,6 +1,7 @@
 import os
 from dotenv import load_dotenv
 from web3 import Web3, HTTPProvider
+from eth_utils import function_signature_to_4byte_selector
 
 # Load environment variables from .env file
 load_dotenv()
@@ -24,6 +25,18 @@ def divide(a, b):
         raise ValueError("Cannot divide by zero!")
     return a / b
 
+# Contract instances cached by (address, abi) so repeated queries against the
+# same contract skip the ABI parsing done by w3.eth.contract
+_CONTRACT_CACHE = {}
+
+def _get_contract(w3, address, abi):
+    key = (address, id(abi))
+    cached = _CONTRACT_CACHE.get(key)
+    if cached is None or cached[0] is not abi:
+        cached = (abi, w3.eth.contract(address=address, abi=abi))
+        _CONTRACT_CACHE[key] = cached
+    return cached[1]
+
 # Function to query any smart contract function
 def query_smart_contract(w3, contract_address, abi, function_name, *args, block_number=None):
     """
@@ -38,8 +51,8 @@ def query_smart_contract(w3, contract_address, abi, function_name, *args, block_
     :return: Result of the function call or an error message
     """
     try:
-        # Create contract instance
-        contract = w3.eth.contract(address=Web3.to_checksum_address(contract_address), abi=abi)
+        # Create (or reuse) contract instance
+        contract = _get_contract(w3, Web3.to_checksum_address(contract_address), abi)
         
         # Get the contract function
         contract_function = getattr(contract.functions, function_name)
@@ -56,3 +69,43 @@ def query_smart_contract(w3, contract_address, abi, function_name, *args, block_
         return f'Error querying smart contract: {e}'
 
 
+# 4-byte selector and argument types cached per function signature
+_SELECTOR_CACHE = {}
+
+# Function to query a view function with a raw eth_call (no contract object)
+def query_smart_contract_raw(w3, contract_address, function_signature, output_types, *args, block_number=None):
+    """
+    Query a smart contract view function via a raw eth_call, skipping
+    contract construction and the contract.functions dispatch entirely.
+
+    :param w3: Web3 instance
+    :param contract_address: Address of the smart contract
+    :param function_signature: Canonical signature, e.g. 'balanceOf(address)'
+    :param output_types: List of ABI output types, e.g. ['uint256']
+    :param args: Arguments to pass to the function (if any)
+    :param block_number: Specific block number to query (optional)
+    :return: Tuple of decoded return values or an error message
+    """
+    try:
+        # Resolve (selector, argument types) once per signature
+        cached = _SELECTOR_CACHE.get(function_signature)
+        if cached is None:
+            selector = function_signature_to_4byte_selector(function_signature)
+            arg_list = function_signature[function_signature.index('(') + 1:-1]
+            arg_types = [t.strip() for t in arg_list.split(',') if t.strip()]
+            cached = _SELECTOR_CACHE.setdefault(function_signature, (selector, arg_types))
+        selector, arg_types = cached
+
+        # Build calldata and hit eth_call directly
+        data = selector + (w3.codec.encode(arg_types, list(args)) if arg_types else b'')
+        call = {'to': Web3.to_checksum_address(contract_address), 'data': data}
+
+        if block_number is not None:
+            raw = w3.eth.call(call, block_identifier=int(block_number))
+        else:
+            raw = w3.eth.call(call)
+
+        return w3.codec.decode(output_types, raw)
+
+    except Exception as e:
+        return f'Error querying smart contract: {e}'